@@ -1,11 +1,37 @@
 """AgentGuard CLI."""
 import click
-import json
+import io
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 import sys
 
-from agentguard.scanner.core import Scanner, Severity
+try:
+    # orjson is optional; it encodes large reports several times faster.
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    def _dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+except ImportError:
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    def _dumps_line(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8") + b"\n"
+
+
+_SEV_EMOJI = {
+    "critical": "🔴",
+    "high": "🟠",
+    "medium": "🟡",
+    "low": "🔵",
+    "info": "⚪",
+}
 
 
 @click.group()
@@ -20,9 +46,9 @@ def cli():
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["text", "json"]),
+    type=click.Choice(["text", "json", "ndjson"]),
     default="text",
-    help="Output format",
+    help="Output format (ndjson streams one scan result per line)",
 )
 @click.option(
     "--severity",
@@ -37,7 +63,17 @@ def cli():
 )
 def scan(path: str, output_format: str, severity: Optional[str], output: Optional[str]):
     """Scan agent configuration for security issues."""
-    scanner = Scanner()
+    from agentguard.scanner.core import Scanner, Severity
+    
+    scanner = Scanner(min_severity=Severity(severity) if severity else None)
+    
+    if output_format == "ndjson":
+        critical_count = write_ndjson_output(scanner.iter_scan(path), output)
+        if output:
+            click.echo(f"Results saved to {output}")
+        if critical_count > 0:
+            sys.exit(1)
+        return
     
     path_obj = Path(path)
     
@@ -47,16 +83,6 @@ def scan(path: str, output_format: str, severity: Optional[str], output: Optiona
     else:
         results = scanner.scan_directory(path)
     
-    # Filter by severity if specified
-    if severity:
-        min_severity = Severity(severity)
-        severity_order = ["critical", "high", "medium", "low", "info"]
-        min_index = severity_order.index(min_severity.value)
-        allowed = severity_order[: min_index + 1]
-        
-        for result in results:
-            result.findings = [f for f in result.findings if f.severity.value in allowed]
-    
     # Output results
     if output_format == "json":
         output_data = {
@@ -64,15 +90,19 @@ def scan(path: str, output_format: str, severity: Optional[str], output: Optiona
             "total_files": len(results),
             "total_findings": sum(len(r.findings) for r in results),
         }
-        output_text = json.dumps(output_data, indent=2)
+        report = _dumps(output_data)
     else:
-        output_text = format_text_output(results)
+        report = format_text_output(results)
     
     if output:
-        Path(output).write_text(output_text)
+        # Written as UTF-8 bytes: orjson leaves non-ASCII unescaped, which the
+        # locale encoding may not be able to represent.
+        if isinstance(report, str):
+            report = report.encode("utf-8")
+        Path(output).write_bytes(report)
         click.echo(f"Results saved to {output}")
     else:
-        click.echo(output_text)
+        click.echo(report)
     
     # Exit with error code if critical findings
     critical_count = sum(
@@ -82,48 +112,69 @@ def scan(path: str, output_format: str, severity: Optional[str], output: Optiona
         sys.exit(1)
 
 
+def write_ndjson_output(results, output: Optional[str]) -> int:
+    """Write each result as one JSON line as soon as it is produced.
+    
+    Returns the number of critical findings written.
+    """
+    from agentguard.scanner.core import Severity
+    
+    critical_count = 0
+    out = open(output, "wb") if output else sys.stdout.buffer
+    try:
+        for result in results:
+            out.write(_dumps_line(result.to_dict()))
+            critical_count += sum(
+                1 for f in result.findings if f.severity == Severity.CRITICAL
+            )
+    finally:
+        if output:
+            out.close()
+        else:
+            out.flush()
+    return critical_count
+
+
 def format_text_output(results) -> str:
     """Format results as human-readable text."""
-    lines = []
-    lines.append("=" * 80)
-    lines.append("AgentGuard Security Scan Results")
-    lines.append("=" * 80)
-    lines.append("")
+    divider = "=" * 80
+    buf = io.StringIO()
+    w = buf.write
+    w("%s\nAgentGuard Security Scan Results\n%s\n" % (divider, divider))
     
     total_findings = 0
     for result in results:
         if not result.findings:
             continue
         
-        lines.append(f"\n📁 {result.file_path}")
-        lines.append("-" * 80)
+        w("\n\n📁 %s\n%s" % (result.file_path, "-" * 80))
         
         for finding in result.findings:
             total_findings += 1
-            severity_emoji = {
-                "critical": "🔴",
-                "high": "🟠",
-                "medium": "🟡",
-                "low": "🔵",
-                "info": "⚪",
-            }.get(finding.severity.value, "⚪")
-            
-            lines.append(f"\n  {severity_emoji} {finding.severity.value.upper()}: {finding.rule_name}")
-            lines.append(f"     Rule: {finding.rule_id}")
-            lines.append(f"     Line {finding.line_number}, Column {finding.column}")
-            lines.append(f"     {finding.message}")
-            lines.append(f"     Snippet: {finding.snippet}")
-            lines.append(f"\n     💡 Remediation: {finding.remediation}")
+            severity = finding.severity.label
+            w(
+                "\n\n  %s %s: %s\n     Rule: %s\n     Line %d, Column %d\n     %s"
+                "\n     Snippet: %s\n\n     💡 Remediation: %s"
+                % (
+                    _SEV_EMOJI.get(severity, "⚪"),
+                    severity.upper(),
+                    finding.rule_name,
+                    finding.rule_id,
+                    finding.line_number,
+                    finding.column,
+                    finding.message,
+                    finding.snippet,
+                    finding.remediation,
+                )
+            )
             if finding.references:
-                lines.append(f"\n     📚 References:")
+                w("\n\n     📚 References:")
                 for ref in finding.references:
-                    lines.append(f"       • {ref}")
+                    w("\n       • %s" % ref)
     
-    lines.append("\n" + "=" * 80)
-    lines.append(f"Scan Complete: {total_findings} finding(s) detected")
-    lines.append("=" * 80)
+    w("\n\n%s\nScan Complete: %d finding(s) detected\n%s" % (divider, total_findings, divider))
     
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 @cli.command()
@@ -135,16 +186,10 @@ def rules():
     click.echo("=" * 80)
     
     for rule in RULES:
-        severity_emoji = {
-            "critical": "🔴",
-            "high": "🟠",
-            "medium": "🟡",
-            "low": "🔵",
-            "info": "⚪",
-        }.get(rule.severity.value, "⚪")
+        severity_emoji = _SEV_EMOJI.get(rule.severity.label, "⚪")
         
         click.echo(f"\n{severity_emoji} {rule.rule_id}: {rule.name}")
-        click.echo(f"   Severity: {rule.severity.value.upper()}")
+        click.echo(f"   Severity: {rule.severity.label.upper()}")
         click.echo(f"   Category: {rule.category.value}")
         click.echo(f"   {rule.description}")
     
@@ -1,19 +1,65 @@
 """AgentGuard - Core scanner module."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Iterator, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+import mmap
+import os
+import queue
 import re
-import yaml
-import json
+import sys
+import threading
+import time
 from pathlib import Path
 
+try:
+    # google-re2 is optional; its DFA engine matches in linear time.
+    import re2
 
-class Severity(Enum):
-    CRITICAL = "critical"
-    HIGH = "high"
-    MEDIUM = "medium"
-    LOW = "low"
-    INFO = "info"
+    def _compile(pattern: bytes) -> Any:
+        options = re2.Options()
+        options.case_sensitive = False
+        # Match bytes as Latin-1, like a stdlib bytes pattern, so case folding
+        # stays ASCII-only and both engines report the same findings.
+        options.encoding = re2.Options.Encoding.LATIN1
+        # RE2 has no multi-line option; (?m) makes ^ and $ match at each line.
+        return re2.compile(b"(?m)" + pattern, options)
+
+except ImportError:
+
+    def _compile(pattern: bytes) -> Any:
+        return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+
+class Severity(IntEnum):
+    """Finding severity; lower values are more severe.
+    
+    Members are ints so thresholds compare directly (``sev <= HIGH``).
+    ``label`` is the lowercase name used in reports, and ``Severity("high")``
+    still looks a member up by label.
+    """
+    CRITICAL = 0
+    HIGH = 1
+    MEDIUM = 2
+    LOW = 3
+    INFO = 4
+    
+    @property
+    def label(self) -> str:
+        return _SEVERITY_LABELS[self]
+    
+    @classmethod
+    def _missing_(cls, value: object) -> Optional["Severity"]:
+        if isinstance(value, str):
+            return cls.__members__.get(value.upper())
+        return None
+
+
+_SEVERITY_LABELS = {severity: severity.name.lower() for severity in Severity}
 
 
 class RuleCategory(Enum):
@@ -25,7 +71,7 @@ class RuleCategory(Enum):
     MEMORY = "memory"
 
 
-@dataclass
+@dataclass(slots=True)
 class Finding:
     """A security finding."""
     rule_id: str
@@ -41,14 +87,22 @@ class Finding:
     references: List[str] = field(default_factory=list)
 
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(slots=True)
 class ScanResult:
     """Result of a scan."""
     file_path: str
     findings: List[Finding]
-    scanned_at: str
+    scanned_at_ns: int
     duration_ms: int
     
+    @property
+    def scanned_at(self) -> str:
+        """UTC scan time in ISO 8601, formatted on demand."""
+        return (_EPOCH + timedelta(microseconds=self.scanned_at_ns // 1000)).isoformat()
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "file_path": self.file_path,
@@ -59,7 +113,7 @@ class ScanResult:
                     "rule_id": f.rule_id,
                     "rule_name": f.rule_name,
                     "category": f.category.value,
-                    "severity": f.severity.value,
+                    "severity": f.severity.label,
                     "message": f.message,
                     "line_number": f.line_number,
                     "column": f.column,
@@ -99,7 +153,15 @@ class Rule:
 
 
 class PatternRule(Rule):
-    """Rule that checks for regex patterns."""
+    """Rule that checks for regex patterns.
+    
+    Patterns are compiled as bytes and matched case-insensitively against
+    the raw file contents in one pass, so a match must not span more than
+    one line; ``\\r\\n``, ``\\r`` and ``\\n`` all end a line. ``^`` and ``$``
+    match at the start and end of each line, but only around ``\\n``: in
+    a CRLF file write ``\\r?$``, and ``^`` does not match after a lone
+    ``\\r``.
+    """
     
     def __init__(
         self,
@@ -112,36 +174,132 @@ class PatternRule(Rule):
         remediation: str,
         references: List[str],
         message_template: str = "Potential {category} issue found",
+        literals: Optional[List[str]] = None,
     ):
+        """``literals`` are ASCII substrings at least one of which occurs in
+        every match (compared case-insensitively); the scanner skips the rule
+        for files that contain none of them. Leave unset if no such list
+        exists.
+        """
         super().__init__(
             rule_id, name, description, category, severity, remediation, references
         )
-        self.pattern = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        self.pattern = _compile(pattern.encode("utf-8"))
         self.message_template = message_template
+        self.literals = tuple(
+            literal.lower().encode("utf-8") for literal in literals or ()
+        )
     
-    def check(self, content: str, file_path: str) -> List[Finding]:
+    def check(
+        self,
+        content: Union[str, bytes],
+        file_path: str,
+        line_starts: Optional[List[int]] = None,
+    ) -> List[Finding]:
+        """Check content for matches of this rule's pattern.
+        
+        ``line_starts`` are the byte offsets from ``_line_starts(content)``;
+        pass them when several rules check the same content.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
         findings = []
-        lines = content.split("\n")
+        if line_starts is None:
+            line_starts = _line_starts(content)
+        fields = self.finding_fields()
         
-        for line_num, line in enumerate(lines, 1):
-            for match in self.pattern.finditer(line):
-                findings.append(
-                    Finding(
-                        rule_id=self.rule_id,
-                        rule_name=self.name,
-                        category=self.category,
-                        severity=self.severity,
-                        message=self.message_template.format(category=self.category.value),
-                        file_path=file_path,
-                        line_number=line_num,
-                        column=match.start() + 1,
-                        snippet=line.strip()[:100],
-                        remediation=self.remediation,
-                        references=self.references,
-                    )
+        for match in self.pattern.finditer(content):
+            line_num = bisect_right(line_starts, match.start())
+            line_start = line_starts[line_num - 1]
+            line = _line(content, line_starts, line_num)
+            findings.append(
+                Finding(
+                    **fields,
+                    file_path=file_path,
+                    line_number=line_num,
+                    column=_column(line, match.start() - line_start),
+                    snippet=_snippet(line),
                 )
+            )
         
         return findings
+    
+    def finding_fields(self) -> Dict[str, Any]:
+        """Finding fields that are the same for every match of this rule."""
+        return {
+            "rule_id": self.rule_id,
+            "rule_name": self.name,
+            "category": self.category,
+            "severity": self.severity,
+            "message": self.message_template.format(category=self.category.value),
+            "remediation": self.remediation,
+            "references": self.references,
+        }
+
+
+def _column(line: bytes, offset: int) -> int:
+    """1-based character column of byte ``offset`` within ``line``."""
+    if line.isascii():
+        return offset + 1
+    return len(line[:offset].decode("utf-8", "replace")) + 1
+
+
+def _snippet(line: bytes) -> str:
+    return line.decode("utf-8", "replace").strip()[:100]
+
+
+def _present_literals(content: bytes, literals: FrozenSet[bytes]) -> Set[bytes]:
+    """Which of ``literals`` occur in ``content``, ignoring ASCII case.
+    
+    Lowercases fixed-size windows rather than the whole content, so a
+    memory-mapped file is never copied in full. Windows overlap by the
+    longest literal so matches across a boundary are not missed.
+    """
+    found: Set[bytes] = set()
+    remaining = set(literals)
+    overlap = max(len(literal) for literal in literals) - 1
+    for start in range(0, len(content), PREFILTER_CHUNK_BYTES):
+        window = content[start:start + PREFILTER_CHUNK_BYTES + overlap].lower()
+        hits = {literal for literal in remaining if literal in window}
+        if hits:
+            found |= hits
+            remaining -= hits
+            if not remaining:
+                break
+    return found
+
+
+# Universal newlines, as Path.read_text used: \r\n, \r and \n all end a line.
+_NEWLINE = re.compile(b"\r\n?|\n")
+
+
+def _line_starts(content: bytes) -> List[int]:
+    """Byte offsets at which each line of ``content`` begins."""
+    line_starts = [0]
+    line_starts.extend(match.end() for match in _NEWLINE.finditer(content))
+    return line_starts
+
+
+def _line(content: bytes, line_starts: List[int], line_num: int) -> bytes:
+    """Line ``line_num`` (1-based) of ``content``, without its terminator."""
+    line_start = line_starts[line_num - 1]
+    if line_num < len(line_starts):
+        return content[line_start:line_starts[line_num]].rstrip(b"\r\n")
+    return content[line_start:]
+
+
+def _build_fused(rules: List[PatternRule]) -> Optional[Any]:
+    """Fuse rule patterns into one alternation used to locate candidate lines."""
+    return _fuse(tuple(rule.pattern.pattern for rule in rules))
+
+
+@lru_cache(maxsize=32)
+def _fuse(patterns: Tuple[bytes, ...]) -> Optional[Any]:
+    # Cached per process, so every Scanner over the same rules (including
+    # severity-filtered ones) shares a single compiled pattern.
+    if not patterns:
+        return None
+    return _compile(b"|".join(b"(?:%s)" % pattern for pattern in patterns))
 
 
 # Define all security rules
@@ -153,13 +311,14 @@ RULES = [
         description="User input is being directly concatenated into system prompts without sanitization",
         category=RuleCategory.PROMPT_INJECTION,
         severity=Severity.CRITICAL,
-        pattern=r'(system_prompt|system|prompt)\s*[=:]\s*["\'].*(\{user_input|\{input|\{\{|%s|%d|\$\{)',
+        pattern=r'(system_prompt|system|prompt)[^\S\r\n]*[=:][^\S\r\n]*["\'][^\r\n]*(\{user_input|\{input|\{\{|%s|%d|\$\{)',
         remediation="Use prompt templates with strict parameter validation. Never concatenate user input directly into system prompts.",
         references=[
             "https://owasp.org/www-project-llm-top-10/",
             "https://portswigger.net/web-security/llm-attacks",
         ],
         message_template="Potential prompt injection: User input concatenated in system prompt",
+        literals=["system", "prompt"],
     ),
     
     # Rule 2: Hardcoded Secrets
@@ -169,12 +328,13 @@ RULES = [
         description="API keys or secrets are hardcoded in configuration",
         category=RuleCategory.SECRETS,
         severity=Severity.CRITICAL,
-        pattern=r'(api[_-]?key|apikey|token|secret|password)\s*[=:]\s*["\'][a-zA-Z0-9_-]{20,}["\']',
+        pattern=r'(api[_-]?key|apikey|token|secret|password)[^\S\r\n]*[=:][^\S\r\n]*["\'][a-zA-Z0-9_-]{20,}["\']',
         remediation="Use environment variables or a secrets manager. Never hardcode credentials.",
         references=[
             "https://cheatsheetseries.owasp.org/cheatsheets/Secrets_Management_Cheat_Sheet.html",
         ],
         message_template="Hardcoded credential detected: {category}",
+        literals=["api", "token", "secret", "password"],
     ),
     
     # Rule 3: Tool Permission Overreach
@@ -184,12 +344,13 @@ RULES = [
         description="Tools have excessive permissions without validation",
         category=RuleCategory.PERMISSIONS,
         severity=Severity.HIGH,
-        pattern=r'(allow_all|unrestricted|bypass.*auth|disable.*check)',
+        pattern=r'(allow_all|unrestricted|bypass[^\r\n]*auth|disable[^\r\n]*check)',
         remediation="Implement least privilege principle. Validate all tool invocations.",
         references=[
             "https://owasp.org/www-project-top-10/",
         ],
         message_template="Excessive permissions detected: {category}",
+        literals=["allow_all", "unrestricted", "bypass", "disable"],
     ),
     
     # Rule 4: Insecure File Access
@@ -199,12 +360,13 @@ RULES = [
         description="File system operations without path validation",
         category=RuleCategory.FILE_ACCESS,
         severity=Severity.HIGH,
-        pattern=r'(read_file|write_file|delete_file)\s*[=:]\s*True|allow_all_files|bypass_path_validation',
+        pattern=r'(read_file|write_file|delete_file)[^\S\r\n]*[=:][^\S\r\n]*True|allow_all_files|bypass_path_validation',
         remediation="Validate all file paths against allowed directories. Use path canonicalization.",
         references=[
             "https://owasp.org/www-community/attacks/Path_Traversal",
         ],
         message_template="Unrestricted file access: {category}",
+        literals=["_file", "bypass_path_validation"],
     ),
     
     # Rule 5: Data Exfiltration
@@ -214,63 +376,386 @@ RULES = [
         description="Tools can send data to external URLs without validation",
         category=RuleCategory.NETWORK,
         severity=Severity.MEDIUM,
-        pattern=r'(http://|https://|fetch\(|requests\.|urllib)',
+        pattern=r'\b(?:https?://|fetch\(|requests\.|urllib)',
         remediation="Validate all external URLs against an allowlist. Log all outbound requests.",
         references=[
             "https://owasp.org/www-project-top-10/",
         ],
         message_template="External network access detected: {category}",
+        literals=["http", "fetch(", "requests.", "urllib"],
     ),
 ]
 
+# Fused pattern for the built-in rules, used by any Scanner running them.
+_COMBINED = _build_fused(RULES)
+
+# File extensions picked up by Scanner.scan_directory.
+SCANNED_EXTENSIONS = (".yaml", ".yml", ".json", ".py")
+
+# Files at least this large are memory-mapped rather than read.
+MMAP_MIN_BYTES = 64 * 1024
+
+# Window size for the case-insensitive literal prefilter.
+PREFILTER_CHUNK_BYTES = 64 * 1024
+
+# How many files the reader thread may load ahead of the scan.
+PREFETCH_DEPTH = 32
+
+# Below this many files, process start-up costs more than the scan itself.
+PARALLEL_MIN_FILES = 64
+
 
 class Scanner:
     """Main scanner class."""
     
-    def __init__(self, rules: Optional[List[Rule]] = None):
+    def __init__(
+        self,
+        rules: Optional[List[Rule]] = None,
+        cache_size: int = 1024,
+        min_severity: Optional[Severity] = None,
+    ):
+        """``cache_size`` bounds how many files' findings are remembered.
+        
+        Entries are keyed on path, mtime and size, so re-scanning an
+        unchanged file (e.g. from an editor integration) skips the rules
+        entirely. Use ``cache_size=0`` to disable the cache.
+        
+        Rules less severe than ``min_severity`` are dropped up front, so
+        they never run.
+        """
         self.rules = rules or RULES
+        # Kept unfiltered for pool workers, which re-apply min_severity.
+        self._worker_args = (None if self.rules is RULES else self.rules, min_severity)
+        if min_severity is not None:
+            self.rules = [r for r in self.rules if r.severity <= min_severity]
+        self.pattern_rules = [r for r in self.rules if isinstance(r, PatternRule)]
+        self.other_rules = [r for r in self.rules if not isinstance(r, PatternRule)]
+        if self.rules is RULES:
+            self.fused = _COMBINED
+        else:
+            self.fused = _build_fused(self.pattern_rules)
+        self.finding_fields = [rule.finding_fields() for rule in self.pattern_rules]
+        self.rule_literals = [rule.literals for rule in self.pattern_rules]
+        self.all_literals = frozenset(
+            literal for literals in self.rule_literals for literal in literals
+        )
+        self.cache_size = cache_size
+        # (path, mtime_ns, size) -> findings, least recently used first
+        self._cache: "OrderedDict[Tuple[str, int, int], List[Finding]]" = OrderedDict()
+        # Held around every cache update; one Scanner may serve several threads.
+        self._cache_lock = threading.Lock()
     
     def scan_file(self, file_path: str) -> ScanResult:
         """Scan a single file."""
-        from datetime import datetime
-        import time
+        start_time = time.perf_counter()
         
-        start_time = time.time()
-        path = Path(file_path)
-        
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        content = path.read_text(encoding="utf-8")
-        findings = []
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        for rule in self.rules:
-            try:
-                rule_findings = rule.check(content, file_path)
-                findings.extend(rule_findings)
-            except Exception as e:
-                print(f"Error running rule {rule.rule_id}: {e}")
+        return self._scan_stat(file_path, stat, None, start_time)
+    
+    def _scan_stat(
+        self,
+        file_path: str,
+        stat: os.stat_result,
+        content: Optional[bytes],
+        start_time: float,
+    ) -> ScanResult:
+        """Scan a file already stat-ed, and possibly read, by the caller."""
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            findings = self._cache.get(key)
+            if findings is not None:
+                self._cache.move_to_end(key)
+        if findings is None:
+            if content is None:
+                findings = self._scan_findings(file_path, stat.st_size)
+            else:
+                findings = self._check_content(content, file_path)
+            if self.cache_size > 0:
+                with self._cache_lock:
+                    self._cache[key] = findings
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        findings = list(findings)
         
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = int((time.perf_counter() - start_time) * 1000)
         
         return ScanResult(
             file_path=file_path,
             findings=findings,
-            scanned_at=datetime.utcnow().isoformat(),
+            scanned_at_ns=time.time_ns(),
             duration_ms=duration_ms,
         )
     
-    def scan_directory(self, directory: str) -> List[ScanResult]:
-        """Scan all files in a directory."""
-        results = []
-        path = Path(directory)
+    def _scan_findings(self, file_path: str, size: int) -> List[Finding]:
+        if size < MMAP_MIN_BYTES:
+            return self._check_content(_read_small(file_path, size), file_path)
+        
+        with open(file_path, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return self._check_content(content, file_path)
+    
+    def _check_content(self, content: bytes, file_path: str) -> List[Finding]:
+        findings = self._check_patterns(content, file_path)
+        if not self.other_rules:
+            return findings
+        
+        text = content[:].decode("utf-8")
+        for rule in self.other_rules:
+            try:
+                rule_findings = rule.check(text, file_path)
+                findings.extend(rule_findings)
+            except Exception as e:
+                print(f"Error running rule {rule.rule_id}: {e}", file=sys.stderr)
+        return findings
+    
+    def _check_patterns(self, content: bytes, file_path: str) -> List[Finding]:
+        """Run every PatternRule over ``content`` in a single fused pass.
+        
+        The fused regex only locates lines with at least one match; each rule
+        is then re-run on those lines alone, so overlapping matches from
+        different rules are all reported, in the same order as running the
+        rules one by one. Matches are gathered as plain tuples and turned
+        into Findings in one pass at the end.
+        
+        Rules whose literals do not occur in the file are skipped first, with
+        plain substring searches; most files then need no regex pass at all.
+        """
+        fused = self.fused
+        if fused is None:
+            return []
+        
+        rules = self.pattern_rules
+        active = range(len(rules))
+        if self.all_literals:
+            present = _present_literals(content, self.all_literals)
+            active = [
+                rule_index
+                for rule_index, literals in enumerate(self.rule_literals)
+                if not literals or not present.isdisjoint(literals)
+            ]
+            if not active:
+                return []
+            if len(active) < len(rules):
+                fused = _fuse(tuple(rules[i].pattern.pattern for i in active))
+        
+        # Newline offsets are only needed once something matches, so files
+        # without findings never pay for them.
+        line_starts = None
+        hit_lines = []
+        # Each search restarts at the next line, so a match that runs past
+        # the end of its line (e.g. a custom rule using \s) cannot hide
+        # matches on the following line.
+        match = fused.search(content)
+        while match is not None:
+            if line_starts is None:
+                line_starts = _line_starts(content)
+            line_num = bisect_right(line_starts, match.start())
+            hit_lines.append(line_num)
+            if line_num >= len(line_starts):
+                break
+            match = fused.search(content, line_starts[line_num])
+        
+        lines: List[bytes] = []
+        # (rule index, index into lines/hit_lines, byte offset in the line)
+        matches: List[Tuple[int, int, int]] = []
+        for line_index, line_num in enumerate(hit_lines):
+            line = _line(content, line_starts, line_num)
+            lines.append(line)
+            for rule_index in active:
+                for match in rules[rule_index].pattern.finditer(line):
+                    matches.append((rule_index, line_index, match.start()))
+        
+        # Stable sort: rule-major, then in file order, like running each rule.
+        matches.sort(key=itemgetter(0))
+        snippets = [_snippet(line) for line in lines]
+        finding_fields = self.finding_fields
+        return [
+            Finding(
+                **finding_fields[rule_index],
+                file_path=file_path,
+                line_number=hit_lines[line_index],
+                column=_column(lines[line_index], offset),
+                snippet=snippets[line_index],
+            )
+            for rule_index, line_index, offset in matches
+        ]
+    
+    def scan_directory(
+        self, directory: str, max_workers: Optional[int] = None
+    ) -> List[ScanResult]:
+        """Scan all files in a directory.
+        
+        Large trees are spread over a process pool of ``max_workers``
+        processes (default: one per CPU); pass ``max_workers=1`` to scan in
+        the current process.
+        """
+        return list(self._iter_directory(directory, max_workers))
+    
+    def iter_scan(
+        self, path: str, max_workers: Optional[int] = None
+    ) -> Iterator[ScanResult]:
+        """Yield results for a file or directory as each file completes.
+        
+        Unlike scan_directory, results are not accumulated, so callers can
+        stream them out with memory bounded by a single file's findings.
+        """
+        if os.path.isdir(path):
+            yield from self._iter_directory(path, max_workers)
+        else:
+            yield self.scan_file(path)
+    
+    def _iter_directory(
+        self, directory: str, max_workers: Optional[int]
+    ) -> Iterator[ScanResult]:
+        file_paths = list(_iter_files(str(Path(directory))))
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        
+        if max_workers <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+            yield from self._scan_prefetched(file_paths)
+            return
+        
+        # Imported here: it pulls in multiprocessing, which would otherwise
+        # dominate start-up when scanning a single file.
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Workers on the default rules are passed None rather than a pickled
+        # copy, so their Scanner uses the module-level _COMBINED built at
+        # import (inherited as-is under fork).
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=self._worker_args,
+        ) as executor:
+            try:
+                for result in executor.map(_scan_one, file_paths, chunksize=32):
+                    if result is not None:
+                        yield result
+            finally:
+                # Don't finish the whole tree if the caller stopped early.
+                executor.shutdown(cancel_futures=True)
+    
+    def _scan_prefetched(self, file_paths: List[str]) -> Iterator[ScanResult]:
+        """Scan files in this process while a reader thread loads the next ones.
+        
+        The reader stats each file and reads small ones ahead into a bounded
+        queue, so disk I/O overlaps with matching. Large files are still
+        memory-mapped by the scan itself, and files already in the cache are
+        not read at all.
+        """
+        loaded: "queue.Queue[Tuple[str, Any, Optional[bytes]]]" = queue.Queue(
+            maxsize=PREFETCH_DEPTH
+        )
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read_ahead, args=(file_paths, loaded, stop), daemon=True
+        )
+        reader.start()
         
-        for file_path in path.rglob("*"):
-            if file_path.is_file() and file_path.suffix in [".yaml", ".yml", ".json", ".py"]:
+        try:
+            for _ in file_paths:
+                file_path, stat, content = loaded.get()
+                if isinstance(stat, Exception):
+                    print(f"Error scanning {file_path}: {stat}", file=sys.stderr)
+                    continue
                 try:
-                    result = self.scan_file(str(file_path))
-                    results.append(result)
+                    result = self._scan_stat(
+                        file_path, stat, content, time.perf_counter()
+                    )
                 except Exception as e:
-                    print(f"Error scanning {file_path}: {e}")
-        
-        return results
+                    print(f"Error scanning {file_path}: {e}", file=sys.stderr)
+                    continue
+                yield result
+        finally:
+            # If the caller stopped early, unblock the reader so it can exit.
+            stop.set()
+            while True:
+                try:
+                    loaded.get_nowait()
+                except queue.Empty:
+                    break
+            reader.join()
+    
+    def _read_ahead(
+        self, file_paths: List[str], loaded: queue.Queue, stop: threading.Event
+    ) -> None:
+        for file_path in file_paths:
+            if stop.is_set():
+                return
+            content = None
+            try:
+                stat = os.stat(file_path)
+                key = (file_path, stat.st_mtime_ns, stat.st_size)
+                # Only a hint: an entry evicted meanwhile is read by _scan_stat.
+                if stat.st_size < MMAP_MIN_BYTES and key not in self._cache:
+                    content = _read_small(file_path, stat.st_size)
+            except Exception as e:
+                stat = e
+            loaded.put((file_path, stat, content))
+    
+    def _scan_file_or_report(self, file_path: str) -> Optional[ScanResult]:
+        try:
+            return self.scan_file(file_path)
+        except Exception as e:
+            print(f"Error scanning {file_path}: {e}", file=sys.stderr)
+            return None
+
+
+def _read_small(file_path: str, size: int) -> bytes:
+    """Read a file below MMAP_MIN_BYTES with one unbuffered read."""
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _iter_files(root: str) -> Iterator[str]:
+    """Yield paths of scannable files under ``root``.
+    
+    Uses os.scandir so file types come from the directory listing instead of
+    a stat() per entry. Directory symlinks are not followed, and directories
+    that cannot be read are skipped. Files come out in the same pre-order as
+    Path.rglob on Python 3.10/3.11: a directory's own files, then each
+    subdirectory in listing order.
+    """
+    # Match Path.rglob, which yields "a.py" rather than "./a.py" for ".".
+    strip = 2 if root == "." else 0
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(SCANNED_EXTENSIONS) and entry.is_file():
+                        yield entry.path[strip:]
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+_worker_scanner: Optional[Scanner] = None
+
+
+def _init_worker(
+    rules: Optional[List[Rule]], min_severity: Optional[Severity]
+) -> None:
+    """Build the per-process Scanner once.
+    
+    ``rules`` are the parent's unfiltered rules: passing the filtered list
+    would turn an empty selection into the default rules. Each worker scans
+    a file only once, so its findings cache is disabled.
+    """
+    global _worker_scanner
+    _worker_scanner = Scanner(rules, cache_size=0, min_severity=min_severity)
+
+
+def _scan_one(file_path: str) -> Optional[ScanResult]:
+    return _worker_scanner._scan_file_or_report(file_path)
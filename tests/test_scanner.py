@@ -0,0 +1,157 @@
+"""Tests for the pattern scanner."""
+import random
+import re
+import unittest
+
+from agentguard.scanner.core import (
+    PatternRule,
+    RULES,
+    RuleCategory,
+    Scanner,
+    Severity,
+)
+
+
+def _rule(rule_id: str, pattern: str, **kwargs) -> PatternRule:
+    return PatternRule(
+        rule_id=rule_id,
+        name=rule_id,
+        description=rule_id,
+        category=RuleCategory.NETWORK,
+        severity=Severity.LOW,
+        pattern=pattern,
+        remediation="",
+        references=[],
+        **kwargs,
+    )
+
+
+def _hits(findings):
+    return [(f.rule_id, f.line_number, f.column) for f in findings]
+
+
+def _per_line_hits(rules, content: bytes):
+    """Reference result: each rule run alone over each line."""
+    lines = re.split(b"\r\n?|\n", content)
+    hits = []
+    for rule in rules:
+        for line_num, line in enumerate(lines, 1):
+            for match in rule.pattern.finditer(line):
+                column = len(line[:match.start()].decode("utf-8", "replace")) + 1
+                hits.append((rule.rule_id, line_num, column))
+    return hits
+
+
+# Fragments that assemble into near-misses and hits for the built-in rules.
+_FRAGMENTS = [
+    "api_key", "token", "secret", "password", "system_prompt", "prompt",
+    "allow_all", "allow_all_files", "unrestricted", "bypass", "auth",
+    "disable", "check", "read_file", "write_file", "True",
+    "bypass_path_validation", "http://", "https://x", "fetch(",
+    "requests.get", "urllib", "{user_input}", "{{", "%s", "${", "url",
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abc123", "=", ":", " ", "\t", '"', "'",
+    'token = "', ' = "', ': "', '"ABCDEFGHIJKLMNOPQRSTUVWXYZ"',
+    "\n", "\n", "\r\n", "\r", "é", "ſ",
+]
+
+
+class AnchorTest(unittest.TestCase):
+    """``^`` and ``$`` match per line, whichever rules share the scanner."""
+    
+    content = b"a\nurl https://x\nurl\n"
+    
+    def test_anchored_rule_alone(self):
+        rule = _rule("X-1", r"^url")
+        expected = [("X-1", 2, 1), ("X-1", 3, 1)]
+        self.assertEqual(_hits(rule.check(self.content, "f")), expected)
+        scanner = Scanner([rule], cache_size=0)
+        self.assertEqual(_hits(scanner._check_patterns(self.content, "f")), expected)
+    
+    def test_anchored_rule_with_builtins(self):
+        rule = _rule("X-1", r"^url")
+        scanner = Scanner([rule] + RULES, cache_size=0)
+        self.assertEqual(
+            _hits(scanner._check_patterns(self.content, "f")),
+            [("X-1", 2, 1), ("X-1", 3, 1), ("AG-005", 2, 5)],
+        )
+    
+    def test_end_anchor(self):
+        rule = _rule("X-1", r"url$")
+        self.assertEqual(_hits(rule.check(self.content, "f")), [("X-1", 3, 1)])
+        scanner = Scanner([rule], cache_size=0)
+        self.assertEqual(
+            _hits(scanner._check_patterns(self.content, "f")), [("X-1", 3, 1)]
+        )
+
+
+class FusedScanTest(unittest.TestCase):
+    """The fused pass must report what each rule finds on its own."""
+    
+    def setUp(self):
+        self.scanner = Scanner(cache_size=0)
+    
+    def test_overlapping_rules(self):
+        content = b"bypass_path_validation_auth: true\nallow_all_files: true\n"
+        self.assertEqual(
+            _hits(self.scanner._check_patterns(content, "f")),
+            [("AG-003", 1, 1), ("AG-003", 2, 1), ("AG-004", 1, 1), ("AG-004", 2, 1)],
+        )
+    
+    def test_line_endings(self):
+        expected = [("AG-004", 3, 1), ("AG-005", 2, 8)]
+        for newline in (b"\n", b"\r\n", b"\r"):
+            content = newline.join(
+                [b"x = 1", b"url = 'http://a'", b"read_file: True", b""]
+            )
+            findings = self.scanner._check_patterns(content, "f")
+            self.assertEqual(_hits(findings), expected, newline)
+            self.assertEqual(findings[1].snippet, "url = 'http://a'")
+    
+    def test_pattern_crossing_newline(self):
+        # A match may run past its line; the next line must still be scanned.
+        rule = _rule("X-1", r"url:\s*\S+")
+        content = b"url:\nurl: https://x\n"
+        scanner = Scanner([rule] + RULES, cache_size=0)
+        self.assertEqual(
+            _hits(scanner._check_patterns(content, "f")),
+            [("X-1", 2, 1), ("AG-005", 2, 6)],
+        )
+    
+    def test_prefilter_skips_absent_literals(self):
+        # Only AG-005's literals occur, so the other rules never run.
+        content = b"fetch('https://x')\n"
+        self.assertEqual(
+            _hits(self.scanner._check_patterns(content, "f")),
+            [("AG-005", 1, 1), ("AG-005", 1, 8)],
+        )
+        # A rule without literals runs regardless.
+        rule = _rule("X-1", r"x'\)")
+        scanner = Scanner([rule] + RULES, cache_size=0)
+        self.assertEqual(
+            _hits(scanner._check_patterns(content, "f")),
+            [("X-1", 1, 16), ("AG-005", 1, 1), ("AG-005", 1, 8)],
+        )
+    
+    def test_matches_rules_run_per_line(self):
+        rules = RULES + [_rule("X-1", r"url:\s*\S+"), _rule("X-2", r"^\S+")]
+        scanner = Scanner(rules, cache_size=0)
+        rng = random.Random(0)
+        for _ in range(500):
+            content = "".join(
+                rng.choice(_FRAGMENTS) for _ in range(rng.randrange(60))
+            ).encode("utf-8")
+            expected = _per_line_hits(rules, content)
+            if b"\r" in content:
+                # ^ only follows \n in the locator; see PatternRule.
+                expected = [hit for hit in expected if hit[0] != "X-2"]
+                scanner_rules = [rule for rule in rules if rule.rule_id != "X-2"]
+                found = Scanner(scanner_rules, cache_size=0)._check_patterns(
+                    content, "f"
+                )
+            else:
+                found = scanner._check_patterns(content, "f")
+            self.assertEqual(_hits(found), expected, content)
+
+
+if __name__ == "__main__":
+    unittest.main()